@@ -5,20 +5,34 @@ This provides a REST API interface for the chemical supplier discovery system,
 designed for production deployment and integration with other systems.
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import Optional, List
+import asyncio
+import logging
+import queue
+import time
 import uvicorn
 import os
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+from celery import states
+from celery.result import AsyncResult
 from dotenv import load_dotenv
 
 from app.agent import run_agent
+from app.scrape_playwright import page_pool, PLAYWRIGHT_POOL_SIZE
+from app.rerank import load_local_bge
+from app.cache import close_client as close_cache_client
+from app.search_serpapi import close_client as close_search_client
+from app.tasks import celery_app, run_agent_task
 from app.schema import AgentResult, SupplierHit
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="Chemical Supplier Discovery API",
     description="AI-powered chemical supplier discovery with evidence validation",
@@ -37,6 +51,77 @@ app.add_middleware(
 )
 
 
+# Uvicorn worker processes when run directly; each one loads its own reranker
+# and browser pool, so memory scales with this
+DEFAULT_WORKERS = 2
+
+_log_listener: Optional[QueueListener] = None
+
+
+@app.on_event("startup")
+async def configure_logging():
+    """
+    Route log records through a queue so request handlers never block on log I/O.
+    
+    A background listener writes them to stderr and, if LOG_FILE is set, to that
+    file. Every worker process appends to the same file, so it is reopened
+    when rotated externally (e.g. by logrotate) rather than rotated here.
+    """
+    global _log_listener
+    
+    formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    handlers = [logging.StreamHandler()]
+    log_file = os.getenv("LOG_FILE")
+    if log_file:
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+        handlers.append(WatchedFileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    root_logger = logging.getLogger()
+    root_logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root_logger.addHandler(QueueHandler(log_queue))
+    
+    _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+
+
+@app.on_event("startup")
+async def start_page_pool():
+    """Launch the shared Playwright browser so requests reuse warm pages."""
+    await page_pool.start(PLAYWRIGHT_POOL_SIZE)
+
+
+@app.on_event("startup")
+async def warm_reranker():
+    """Load the BGE reranker up front so the first search doesn't pay for it."""
+    try:
+        await asyncio.to_thread(load_local_bge)
+    except Exception as e:
+        logger.warning("Could not preload BGE reranker: %s", e)
+
+
+@app.on_event("shutdown")
+async def close_page_pool():
+    """Close the shared Playwright browser."""
+    await page_pool.close()
+
+
+@app.on_event("shutdown")
+async def close_clients():
+    """Close the SerpAPI HTTP client and the Redis cache client."""
+    await close_search_client()
+    await close_cache_client()
+
+
+@app.on_event("shutdown")
+async def stop_logging():
+    """Flush queued log records."""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+
 class SearchRequest(BaseModel):
     """Request model for supplier search."""
     chemical_name: str = Field(..., description="Name of the chemical to search for")
@@ -93,82 +178,110 @@ async def search_suppliers(request: SearchRequest):
     
     This endpoint performs the complete supplier discovery pipeline:
     1. Web search for potential suppliers
-    2. Website scraping and CAS number validation
-    3. AI-powered relevance ranking
+    2. AI-powered relevance ranking
+    3. Website scraping and CAS number validation (most relevant first)
     4. Geographic filtering
     5. Email discovery and validation
     
     Returns a list of verified suppliers with evidence links.
     """
+    start_time = time.time()
+    
+    # Validate API key
+    if not os.getenv("SERPAPI_KEY"):
+        raise HTTPException(
+            status_code=500,
+            detail="SERPAPI_KEY not configured. Please check server configuration."
+        )
+    
+    # Convert country lists to sets
+    excluded_countries = set(request.excluded_countries or [])
+    allowed_countries = set(request.allowed_countries or [])
+    
+    # Validate mutual exclusion
+    if excluded_countries and allowed_countries:
+        raise HTTPException(
+            status_code=400,
+            detail="Cannot specify both excluded_countries and allowed_countries. Use one or the other."
+        )
+    
+    # Run the agent (awaited, so the event loop keeps serving other requests)
     try:
-        import time
-        start_time = time.time()
-        
-        # Validate API key
-        if not os.getenv("SERPAPI_KEY"):
-            raise HTTPException(
-                status_code=500,
-                detail="SERPAPI_KEY not configured. Please check server configuration."
-            )
-        
-        # Convert country lists to sets
-        excluded_countries = set(request.excluded_countries or [])
-        allowed_countries = set(request.allowed_countries or [])
-        
-        # Validate mutual exclusion
-        if excluded_countries and allowed_countries:
-            raise HTTPException(
-                status_code=400,
-                detail="Cannot specify both excluded_countries and allowed_countries. Use one or the other."
-            )
-        
-        # Run the agent
-        result = run_agent(
+        result = await run_agent(
             chemical_name=request.chemical_name,
             cas=request.cas_number,
             limit=request.limit,
             excluded_countries=excluded_countries,
             allowed_countries=allowed_countries
         )
-        
-        processing_time = time.time() - start_time
-        
-        return SearchResponse(
-            success=True,
-            message=f"Found {len(result.suppliers)} suppliers for {request.chemical_name}",
-            data=result,
-            processing_time_seconds=round(processing_time, 2)
-        )
-        
     except Exception as e:
-        # Log error in production
-        print(f"Search error: {str(e)}")
-        
+        logger.exception("Search failed")
         raise HTTPException(
             status_code=500,
-            detail=f"Search failed: {str(e)}"
+            detail=f"Search failed: {e}"
         )
+    
+    processing_time = time.time() - start_time
+    
+    return SearchResponse(
+        success=True,
+        message=f"Found {len(result.suppliers)} suppliers for {request.chemical_name}",
+        data=result,
+        processing_time_seconds=round(processing_time, 2)
+    )
 
 
 @app.post("/search/async", response_model=dict)
-async def search_suppliers_async(request: SearchRequest, background_tasks: BackgroundTasks):
+async def search_suppliers_async(request: SearchRequest):
     """
     Asynchronous supplier search for long-running requests.
     
     Returns immediately with a task ID. Use /status/{task_id} to check progress.
     This is useful for batch processing or when expecting longer processing times.
     """
-    # In production, implement with Celery, RQ, or similar task queue
-    import uuid
-    task_id = str(uuid.uuid4())
+    if request.excluded_countries and request.allowed_countries:
+        raise HTTPException(
+            status_code=400,
+            detail="Cannot specify both excluded_countries and allowed_countries. Use one or the other."
+        )
+    
+    # Queue the search on a Celery worker
+    task = await asyncio.to_thread(
+        run_agent_task.delay,
+        request.chemical_name,
+        request.cas_number,
+        request.limit,
+        request.excluded_countries,
+        request.allowed_countries
+    )
     
-    # This is a simplified implementation
-    # In production, you'd use a proper task queue
     return {
-        "task_id": task_id,
+        "task_id": task.id,
         "status": "accepted",
-        "message": "Search task queued. Use /status/{task_id} to check progress."
+        "message": f"Search task queued. Use /status/{task.id} to check progress."
+    }
+
+
+@app.get("/status/{task_id}", response_model=dict)
+async def get_task_status(task_id: str):
+    """Get the state of a queued search and its result once finished."""
+    # Reading the result backend blocks, so do it off the event loop, once
+    def read_task():
+        task = AsyncResult(task_id, app=celery_app)
+        return task.state, task.result
+    
+    state, result = await asyncio.to_thread(read_task)
+    
+    response = {
+        "task_id": task_id,
+        "status": state
     }
+    if state == states.SUCCESS:
+        response["data"] = result
+    elif state == states.FAILURE:
+        response["error"] = str(result)
+    
+    return response
 
 
 @app.get("/countries", response_model=dict)
@@ -208,12 +321,18 @@ async def internal_error_handler(request, exc):
 
 
 if __name__ == "__main__":
-    # Development server
+    # Searches are awaited on the event loop, so each worker serves concurrent
+    # requests. Each worker holds its own reranker and browser pool, so memory
+    # grows with the worker count; the default stays small. Set RELOAD=true
+    # for a single-process development server with auto-reload.
     port = int(os.getenv("PORT", 8000))
+    reload = os.getenv("RELOAD", "false").lower() == "true"
+    workers = 1 if reload else int(os.getenv("WORKERS", DEFAULT_WORKERS))
     uvicorn.run(
         "api:app",
         host="0.0.0.0",
         port=port,
-        reload=True,
+        reload=reload,
+        workers=workers,
         log_level="info"
     )
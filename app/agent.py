@@ -1,13 +1,55 @@
 """Main agent orchestration for chemical supplier discovery."""
-import concurrent.futures
+import asyncio
+import heapq
+import logging
+import re
 from urllib.parse import urlparse
 from typing import Dict
 
+import ahocorasick
+
 from .search_serpapi import search_candidates
-from .scrape_playwright import scrape_and_extract
-from .rerank import rerank_score
+from .scrape_playwright import scrape_and_extract, open_page_pool
+from .rerank import batch_rerank, rerank_backends
+from .cache import cached_batch_rerank
 from .schema import SupplierHit, AgentResult
 
+logger = logging.getLogger(__name__)
+
+
+# Evidence URL keywords, by the confidence signal they indicate
+_SDS_KW = ("sds", "tds", "datasheet")
+_CATALOG_KW = ("catalog", "product")
+_DIRECTORY_DOMAINS = (
+    "buyersguidechem.com", "chemondis.com", "thomasnet.com",
+    "chemspider.com", "molport.com"
+)
+
+# All keywords are matched in a single Aho-Corasick pass over each URL
+_EVIDENCE_AUTOMATON = ahocorasick.Automaton()
+for _signal, _keywords in (
+    ("datasheet", _SDS_KW),
+    ("product", _CATALOG_KW),
+    ("directory", _DIRECTORY_DOMAINS),
+):
+    for _keyword in _keywords:
+        _EVIDENCE_AUTOMATON.add_word(_keyword, _signal)
+_EVIDENCE_AUTOMATON.make_automaton()
+
+
+# Host part of an http(s) URL; cheaper than urlparse for supplier websites
+_DOMAIN_RE = re.compile(r"^https?://([^/?#]+)")
+
+# Scraping stops early once `limit` unique domains reach at least this confidence
+EARLY_EXIT_MIN_CONFIDENCE = 5.0
+
+
+def _country_allowed(country: str, allowed_countries: set, excluded_countries: set) -> bool:
+    """Apply the country filter (allowed countries take precedence over excluded)."""
+    if allowed_countries:
+        return country in allowed_countries
+    return country not in excluded_countries
+
 
 def calculate_confidence_score(
     search_result: Dict,
@@ -36,18 +78,18 @@ def calculate_confidence_score(
     if cas in search_text:
         score += 3.0  # CAS in search results
     
-    # Evidence page type signals
+    # Signal classes present in the evidence URL, found in a single pass
     evidence_url = scraped_data.get("evidence_url", "").lower()
-    if any(keyword in evidence_url for keyword in ["sds", "tds", "datasheet"]):
+    signals = {signal for _, signal in _EVIDENCE_AUTOMATON.iter(evidence_url)}
+    
+    # Evidence page type signals
+    if "datasheet" in signals:
         score += 2.0  # Safety data sheet or technical data sheet
-    elif any(keyword in evidence_url for keyword in ["catalog", "product"]):
+    elif "product" in signals:
         score += 1.5  # Product catalog or product page
     
     # Marketplace/directory signals
-    if any(domain in evidence_url for domain in [
-        "buyersguidechem.com", "chemondis.com", "thomasnet.com", 
-        "chemspider.com", "molport.com"
-    ]):
+    if "directory" in signals:
         score += 1.0  # Known chemical supplier directory
     
     # Reranker score (0-1 range, scale to 0-4 points)
@@ -61,26 +103,11 @@ def calculate_confidence_score(
     return min(10.0, round(score, 2))
 
 
-def process_single_candidate(args) -> Dict:
-    """Process a single search candidate. Used for parallel processing."""
-    search_result, cas, query = args
-    
-    url = search_result["link"]
-    
-    # Scrape the page for CAS evidence
-    scraped_data = scrape_and_extract(url, cas)
-    if not scraped_data:
-        return None
-    
-    # Calculate rerank score
-    text_for_rerank = (search_result.get("title", "") + " " + 
-                       search_result.get("snippet", ""))
-    rerank_score_val = rerank_score(query, text_for_rerank)
-    
-    # Calculate confidence score
-    confidence = calculate_confidence_score(
-        search_result, scraped_data, rerank_score_val, cas
-    )
+def process_single_candidate(scraped_data: Dict, confidence: float) -> Dict:
+    """Build a supplier result from a scraped candidate and its confidence score."""
+    website = scraped_data["website"]
+    match = _DOMAIN_RE.match(website)
+    domain = match.group(1) if match else website
     
     # Use scraped emails or generate common patterns
     emails = scraped_data.get("emails", [])
@@ -89,23 +116,22 @@ def process_single_candidate(args) -> Dict:
         email_status = "found"
     else:
         # Generate common email pattern
-        domain = urlparse(scraped_data["website"]).netloc
         email = f"info@{domain}"
         email_status = "generated"
     
     return {
         "supplier_name": scraped_data["supplier_name"],
-        "website": scraped_data["website"],
+        "website": website,
         "contact_email": email,
         "email_status": email_status,
         "evidence_url": scraped_data["evidence_url"],
         "confidence_score": confidence,
-        "domain": urlparse(scraped_data["website"]).netloc,
+        "domain": domain,
         "country": scraped_data.get("country", "Unknown")
     }
 
 
-def run_agent(
+async def run_agent(
     chemical_name: str, 
     cas: str, 
     limit: int = 10,
@@ -122,7 +148,7 @@ def run_agent(
         cas: CAS number (e.g., "872-50-4")
         limit: Number of suppliers to return
         max_candidates: Maximum search candidates to process
-        max_workers: Maximum parallel workers for scraping
+        max_workers: Maximum concurrent page scrapes
         excluded_countries: Set of country names to exclude from results
         allowed_countries: Set of country names to include ONLY (takes precedence over excluded_countries)
         
@@ -134,13 +160,24 @@ def run_agent(
     if allowed_countries is None:
         allowed_countries = set()
     query = f"{chemical_name} {cas}"
-    print(f"Searching for: {query}")
+    logger.info("Searching for: %s", query)
     
     # Step 1: Search for candidates
-    print("Searching for supplier candidates...")
-    candidates = search_candidates(chemical_name, cas, num_pages=2)
+    logger.info("Searching for supplier candidates...")
+    candidates = await search_candidates(chemical_name, cas, num_pages=2)
     candidates = candidates[:max_candidates]  # Limit candidates to process
-    print(f"Found {len(candidates)} search candidates")
+    
+    # Keep only the first (highest-ranked) search result per domain so each
+    # site is scraped once
+    candidate_domains = set()
+    unique_candidates = []
+    for candidate in candidates:
+        domain = urlparse(candidate["link"]).netloc
+        if domain not in candidate_domains:
+            candidate_domains.add(domain)
+            unique_candidates.append(candidate)
+    candidates = unique_candidates
+    logger.info("Found %d search candidates", len(candidates))
     
     if not candidates:
         return AgentResult(
@@ -149,47 +186,101 @@ def run_agent(
             suppliers=[]
         )
     
-    # Step 2: Process candidates in parallel
-    print("Scraping candidates for evidence...")
-    results = []
+    # Step 2: Rerank all candidates on title+snippet in a single batch (cached
+    # scores are reused) and scrape the most relevant candidates first
+    texts_for_rerank = [
+        candidate.get("title", "") + " " + candidate.get("snippet", "")
+        for candidate in candidates
+    ]
+    rerank_scores = await cached_batch_rerank(
+        query, texts_for_rerank, batch_rerank, rerank_backends(len(texts_for_rerank))
+    )
+    ranked = sorted(zip(candidates, rerank_scores), key=lambda x: x[1], reverse=True)
     
-    # Prepare arguments for parallel processing
-    candidate_args = [(candidate, cas, query) for candidate in candidates]
+    # Step 3: Scrape candidates concurrently using pooled browser pages,
+    # stopping early once enough strong, unique-domain results are in
+    logger.info("Scraping candidates for evidence...")
+    scraped = []
+    best_by_domain = {}  # Confidence of the best result per domain
+    processed = 0
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_candidate = {
-            executor.submit(process_single_candidate, args): args[0] 
-            for args in candidate_args
+    async with open_page_pool(min(max_workers, len(ranked))) as pool:
+        sem = asyncio.Semaphore(max_workers)
+        
+        async def bounded(candidate):
+            async with sem, pool.acquire() as page:
+                return await scrape_and_extract(page, candidate["link"], cas)
+        
+        # Tasks are created in rank order, so pages go to the best candidates first
+        tasks = {
+            asyncio.create_task(bounded(candidate)): (index, candidate, rerank_score_val)
+            for index, (candidate, rerank_score_val) in enumerate(ranked)
         }
+        pending = set(tasks)
         
-        for future in concurrent.futures.as_completed(future_to_candidate):
-            try:
-                result = future.result()
-                if result:
-                    results.append(result)
-            except Exception as e:
-                candidate = future_to_candidate[future]
-                print(f"Error processing {candidate.get('link', 'unknown')}: {e}")
-    
-    print(f"Successfully processed {len(results)} suppliers with evidence")
-    
-    # Step 3: Filter by country preferences
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    index, candidate, rerank_score_val = tasks[task]
+                    processed += 1
+                    try:
+                        scraped_data = task.result()
+                    except Exception as e:
+                        logger.warning("Error processing %s: %s", candidate.get("link", "unknown"), e)
+                        continue
+                    if not scraped_data:
+                        continue
+                    
+                    confidence = calculate_confidence_score(
+                        candidate, scraped_data, rerank_score_val, cas
+                    )
+                    scraped.append((index, scraped_data, confidence))
+                    if not _country_allowed(
+                        scraped_data.get("country", "Unknown"), allowed_countries, excluded_countries
+                    ):
+                        continue
+                    
+                    website = scraped_data["website"]
+                    best_by_domain[website] = max(best_by_domain.get(website, 0.0), confidence)
+                
+                if pending and processed >= 2 * limit:
+                    top_scores = heapq.nlargest(limit, best_by_domain.values())
+                    if len(top_scores) >= limit and top_scores[-1] >= EARLY_EXIT_MIN_CONFIDENCE:
+                        logger.info("Found %d strong suppliers, skipping %d remaining candidates", limit, len(pending))
+                        break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    # Keep rank order for stable tie-breaking
+    scraped.sort(key=lambda x: x[0])
+    results = [
+        process_single_candidate(scraped_data, confidence)
+        for _, scraped_data, confidence in scraped
+    ]
+    
+    logger.info("Successfully processed %d suppliers with evidence", len(results))
+    
+    # Step 4: Filter by country preferences
     if allowed_countries:
         # Only include suppliers from allowed countries
         before_filter = len(results)
         results = [r for r in results if r.get("country", "Unknown") in allowed_countries]
         filtered_count = before_filter - len(results)
         if filtered_count > 0:
-            print(f"Filtered to only suppliers from allowed countries ({filtered_count} excluded)")
+            logger.info("Filtered to only suppliers from allowed countries (%d excluded)", filtered_count)
     elif excluded_countries:
         # Exclude suppliers from specific countries
         before_filter = len(results)
         results = [r for r in results if r.get("country", "Unknown") not in excluded_countries]
         filtered_count = before_filter - len(results)
         if filtered_count > 0:
-            print(f"Filtered out {filtered_count} suppliers from excluded countries")
+            logger.info("Filtered out %d suppliers from excluded countries", filtered_count)
     
-    # Step 4: Deduplicate by domain and sort by confidence
+    # Step 5: Deduplicate by domain and sort by confidence
     seen_domains = set()
     unique_results = []
     
@@ -205,7 +296,7 @@ def run_agent(
             if len(unique_results) >= limit:
                 break
     
-    # Step 5: Convert to Pydantic models
+    # Step 6: Convert to Pydantic models
     suppliers = []
     for result in unique_results:
         try:
@@ -220,10 +311,10 @@ def run_agent(
             )
             suppliers.append(supplier)
         except Exception as e:
-            print(f"Error creating SupplierHit: {e}")
+            logger.warning("Error creating SupplierHit: %s", e)
             continue
     
-    print(f"Returning {len(suppliers)} unique suppliers")
+    logger.info("Returning %d unique suppliers", len(suppliers))
     
     return AgentResult(
         chemical_name=chemical_name,
@@ -0,0 +1,156 @@
+"""Redis-backed caching for rerank scores and scrape results."""
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import struct
+from typing import Callable, List, Optional
+
+import msgpack
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Cache lifetimes in seconds
+RERANK_TTL = 24 * 60 * 60
+SCRAPE_TTL = 6 * 60 * 60
+
+# Redis clients are bound to the event loop they were created on
+_client = None
+_client_loop = None
+
+
+def get_client() -> Optional[aioredis.Redis]:
+    """Return a Redis client for the running event loop, or None if REDIS_URL is unset."""
+    global _client, _client_loop
+    
+    redis_url = os.environ.get("REDIS_URL")
+    if not redis_url:
+        return None
+    
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = aioredis.Redis.from_url(redis_url)
+        _client_loop = loop
+    return _client
+
+
+async def close_client():
+    """Close the Redis client, if one was created; call before its event loop ends."""
+    global _client, _client_loop
+    
+    if _client is not None:
+        client, _client, _client_loop = _client, None, None
+        await client.aclose()
+
+
+def _cache_key(prefix: str, *parts: str) -> str:
+    """Build a compact cache key from a prefix and the SHA-1 of the parts."""
+    digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+async def _cached_backend_scores(
+    query: str,
+    texts: List[str],
+    rerank_fn: Callable[[str, List[str], str], List[float]],
+    backend: str
+) -> List[float]:
+    """Score texts with one backend, reusing that backend's cached scores."""
+    client = get_client()
+    if client is None or not texts:
+        return await asyncio.to_thread(rerank_fn, query, texts, backend)
+    
+    keys = [_cache_key(f"rerank:{backend}", query, text) for text in texts]
+    try:
+        cached = await client.mget(keys)
+    except RedisError as e:
+        logger.warning("Rerank cache read error: %s", e)
+        cached = [None] * len(texts)
+    
+    scores = [struct.unpack("<f", value)[0] if value else None for value in cached]
+    missing = [i for i, score in enumerate(scores) if score is None]
+    if not missing:
+        return scores
+    
+    computed = await asyncio.to_thread(rerank_fn, query, [texts[i] for i in missing], backend)
+    for i, score in zip(missing, computed):
+        scores[i] = score
+    
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for i, score in zip(missing, computed):
+                # A zero score means the scorer failed; don't cache it
+                if score > 0:
+                    pipe.setex(keys[i], RERANK_TTL, struct.pack("<f", score))
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning("Rerank cache write error: %s", e)
+    
+    return scores
+
+
+async def cached_batch_rerank(
+    query: str,
+    texts: List[str],
+    rerank_fn: Callable[[str, List[str], str], List[float]],
+    backends: List[str]
+) -> List[float]:
+    """
+    Score texts against a query, reusing cached scores where available.
+    
+    Backends score on different scales, so every text in a ranking is scored
+    by the same backend and cached scores are keyed by backend.
+    
+    Args:
+        query: Search query
+        texts: Texts to score
+        rerank_fn: Blocking batch scorer, called (in a thread) as
+            rerank_fn(query, texts, backend) with only the uncached texts
+        backends: Backends to try in order; the next one rescores the whole
+            ranking if any score is zero (a failure)
+    
+    Returns:
+        List of relevance scores in the same order as texts
+    """
+    scores = [0.0] * len(texts)
+    for backend in backends:
+        scores = await _cached_backend_scores(query, texts, rerank_fn, backend)
+        if all(score > 0 for score in scores):
+            break
+    return scores
+
+
+def cached_scrape(scrape_fn):
+    """
+    Cache successful results of an async scrape_and_extract(page, url, cas).
+    
+    Results are keyed by (url, cas) and stored as MessagePack.
+    """
+    @functools.wraps(scrape_fn)
+    async def wrapper(page, url: str, cas: str):
+        client = get_client()
+        if client is None:
+            return await scrape_fn(page, url, cas)
+        
+        key = _cache_key("scrape", url, cas)
+        try:
+            cached = await client.get(key)
+            if cached:
+                return msgpack.unpackb(cached, raw=False)
+        except RedisError as e:
+            logger.warning("Scrape cache read error: %s", e)
+        
+        result = await scrape_fn(page, url, cas)
+        
+        if result:
+            try:
+                await client.setex(key, SCRAPE_TTL, msgpack.packb(result, use_bin_type=True))
+            except RedisError as e:
+                logger.warning("Scrape cache write error: %s", e)
+        
+        return result
+    
+    return wrapper
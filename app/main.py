@@ -1,6 +1,8 @@
 """Command-line interface for the chemical supplier agent."""
 import argparse
+import asyncio
 import json
+import logging
 import os
 import sys
 from dotenv import load_dotenv
@@ -67,13 +69,19 @@ Examples:
     
     args = parser.parse_args()
     
+    # Agent progress goes to stderr; only shown with --verbose
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(message)s"
+    )
+    
     try:
         # Run the agent
-        result = run_agent(
+        result = asyncio.run(run_agent(
             chemical_name=args.name,
             cas=args.cas,
             limit=args.limit
-        )
+        ))
         
         # Output results
         if args.output == "json":
@@ -1,150 +1,383 @@
 """Relevance reranking using BGE or Cohere models."""
+import asyncio
+import glob
+import logging
 import os
-import math
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+BGE_MODEL_NAME = "BAAI/bge-reranker-v2-m3"
+
+# Directory holding the exported int8 ONNX model (built on first load)
+BGE_ONNX_DIR = os.environ.get(
+    "BGE_ONNX_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "bge-reranker-v2-m3-int8")
+)
+BGE_ONNX_FILE = "model_quantized.onnx"
+
+# Name prefix of the temporary directories exports are built in
+BGE_BUILD_PREFIX = ".bge-onnx-"
 
 # Global model cache for BGE
 _model = None
 _tokenizer = None
+_backend = None  # "onnx" or "torch"
+
+# Shared Cohere client, so its HTTP connections are reused across calls
+_cohere_client = None
+
+
+def _export_bge_onnx_int8():
+    """
+    Export BGE to ONNX and quantize it to int8 in BGE_ONNX_DIR.
+    
+    The model is built in a temporary sibling directory and moved into place
+    only once complete, so an interrupted export never leaves a directory that
+    looks usable.
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    from transformers import AutoTokenizer
+    
+    parent_dir = os.path.dirname(os.path.abspath(BGE_ONNX_DIR))
+    os.makedirs(parent_dir, exist_ok=True)
+    
+    # Remove build directories left by exports that were killed part-way;
+    # callers hold the export lock, so none of them is still in progress
+    for stale_dir in glob.glob(os.path.join(parent_dir, BGE_BUILD_PREFIX + "*")):
+        shutil.rmtree(stale_dir, ignore_errors=True)
+    
+    build_dir = tempfile.mkdtemp(prefix=BGE_BUILD_PREFIX, dir=parent_dir)
+    try:
+        export_dir = os.path.join(build_dir, "fp32")
+        ORTModelForSequenceClassification.from_pretrained(
+            BGE_MODEL_NAME,
+            export=True,
+            provider="CPUExecutionProvider"
+        ).save_pretrained(export_dir)
+        AutoTokenizer.from_pretrained(BGE_MODEL_NAME).save_pretrained(build_dir)
+        quantize_dynamic(
+            os.path.join(export_dir, "model.onnx"),
+            os.path.join(build_dir, BGE_ONNX_FILE),
+            weight_type=QuantType.QInt8
+        )
+        # Keep only the config next to the quantized weights; drop the FP32 export
+        shutil.copy(os.path.join(export_dir, "config.json"), build_dir)
+        shutil.rmtree(export_dir)
+        
+        # Clear out an incomplete directory left by an older layout, then swap in
+        shutil.rmtree(BGE_ONNX_DIR, ignore_errors=True)
+        os.replace(build_dir, BGE_ONNX_DIR)
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+
+@contextmanager
+def _export_lock():
+    """Hold an exclusive file lock so only one process exports the model at a time."""
+    parent_dir = os.path.dirname(os.path.abspath(BGE_ONNX_DIR))
+    os.makedirs(parent_dir, exist_ok=True)
+    with open(os.path.abspath(BGE_ONNX_DIR) + ".lock", "w") as lock_file:
+        try:
+            import fcntl
+        except ImportError:
+            # No flock (e.g. Windows); exports are still atomic, just not serialized
+            yield
+            return
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _load_bge_onnx_int8():
+    """Load the int8 ONNX BGE model, exporting it first if it isn't on disk yet."""
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer
+    
+    model_path = os.path.join(BGE_ONNX_DIR, BGE_ONNX_FILE)
+    if not os.path.exists(model_path):
+        # Workers start together; the first one exports, the rest wait and reuse it
+        with _export_lock():
+            if not os.path.exists(model_path):
+                _export_bge_onnx_int8()
+    
+    tokenizer = AutoTokenizer.from_pretrained(BGE_ONNX_DIR)
+    model = ORTModelForSequenceClassification.from_pretrained(
+        BGE_ONNX_DIR,
+        file_name=BGE_ONNX_FILE,
+        provider="CPUExecutionProvider"
+    )
+    return model, tokenizer
+
+
+def _load_bge_torch():
+    """Load the FP32 BGE model with transformers and torch."""
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    import torch
+    
+    tokenizer = AutoTokenizer.from_pretrained(BGE_MODEL_NAME)
+    model = AutoModelForSequenceClassification.from_pretrained(
+        BGE_MODEL_NAME, 
+        trust_remote_code=True
+    )
+    model.eval()
+    
+    torch.set_num_threads(int(os.environ.get("TORCH_NUM_THREADS", os.cpu_count() or 1)))
+    if os.environ.get("BGE_TORCH_COMPILE", "false").lower() == "true":
+        # Fuse kernels. Compilation is lazy and needs a C compiler, so run one
+        # forward pass now and keep the eager model if it fails.
+        compiled = torch.compile(model, dynamic=True)
+        try:
+            with torch.inference_mode():
+                compiled(**tokenizer([["warm up", "warm up"]], return_tensors="pt"))
+            model = compiled
+        except Exception as e:
+            logger.warning("torch.compile failed, using the eager BGE model: %s", e)
+    
+    return model, tokenizer
 
 
 def load_local_bge():
-    """Load BGE reranker model locally (cached)."""
-    global _model, _tokenizer
+    """
+    Load BGE reranker model locally (cached).
+    
+    Prefers an int8-quantized ONNX Runtime model; falls back to the FP32
+    transformers model when optimum/onnxruntime are not installed or the
+    ONNX model can't be exported or loaded.
+    """
+    global _model, _tokenizer, _backend
     
     if _model is None:
         try:
-            from transformers import AutoTokenizer, AutoModelForSequenceClassification
-            import torch
-            
-            model_name = "BAAI/bge-reranker-v2-m3"
-            _tokenizer = AutoTokenizer.from_pretrained(model_name)
-            _model = AutoModelForSequenceClassification.from_pretrained(
-                model_name, 
-                trust_remote_code=True
-            )
-            print(f"Loaded BGE reranker: {model_name}")
-        except ImportError as e:
-            raise ImportError(
-                "BGE reranker requires transformers and torch. "
-                f"Install with: pip install transformers torch. Error: {e}"
-            )
+            _model, _tokenizer = _load_bge_onnx_int8()
+            _backend = "onnx"
+        except Exception as e:
+            logger.warning("Int8 ONNX reranker unavailable, falling back to torch: %s", e)
+            try:
+                _model, _tokenizer = _load_bge_torch()
+                _backend = "torch"
+            except ImportError as e:
+                raise ImportError(
+                    "BGE reranker requires optimum[onnxruntime] or transformers and torch. "
+                    f"Install with: pip install optimum[onnxruntime]. Error: {e}"
+                )
+        logger.info("Loaded BGE reranker: %s (%s)", BGE_MODEL_NAME, _backend)
     
     return _model, _tokenizer
 
 
-def rerank_score_bge(query: str, text: str) -> float:
+def rerank_score_bge_batch(pairs: list[list[str]]) -> list[float]:
     """
-    Score relevance using local BGE reranker model.
+    Score many (query, text) pairs with the local BGE reranker in one forward pass.
     
     Args:
-        query: Search query (e.g., "N-Methyl-2-pyrrolidone 872-50-4")
-        text: Text to score against query
+        pairs: List of [query, text] pairs to score
         
     Returns:
-        Relevance score between 0 and 1
+        Relevance scores between 0 and 1, in the same order as pairs
     """
+    if not pairs:
+        return []
+    
     try:
-        import torch
-        
         model, tokenizer = load_local_bge()
         
-        # Prepare inputs
+        if _backend == "onnx":
+            import numpy as np
+            
+            # Tokenize all pairs as a single padded batch
+            inputs = tokenizer(
+                pairs, 
+                padding=True, 
+                truncation=True, 
+                return_tensors="np",
+                max_length=512
+            )
+            
+            # Get relevance scores for the whole batch
+            logits = np.asarray(model(**inputs).logits, dtype=np.float32).reshape(-1)
+            
+            # Convert logits to probabilities using sigmoid
+            return (1.0 / (1.0 + np.exp(-logits))).tolist()
+        
+        import torch
+        
+        # Tokenize all pairs as a single padded batch
         inputs = tokenizer(
-            [[query, text]], 
+            pairs, 
             padding=True, 
             truncation=True, 
             return_tensors="pt",
             max_length=512
         )
         
-        # Get relevance score
-        with torch.no_grad():
+        # Get relevance scores for the whole batch
+        with torch.inference_mode():
             logits = model(**inputs).logits
         
-        # Convert logits to probability using sigmoid
-        score = 1 / (1 + math.exp(-float(logits[0][0])))
-        return score
+        # Convert logits to probabilities using sigmoid
+        scores = torch.sigmoid(logits.view(-1).float())
+        return scores.tolist()
         
     except Exception as e:
-        print(f"BGE scoring error: {e}")
-        return 0.0
+        logger.warning("BGE scoring error: %s", e)
+        return [0.0] * len(pairs)
 
 
-def rerank_score_cohere(query: str, text: str) -> float:
+def rerank_score_bge(query: str, text: str) -> float:
     """
-    Score relevance using Cohere Rerank API.
+    Score relevance using local BGE reranker model.
     
     Args:
-        query: Search query
+        query: Search query (e.g., "N-Methyl-2-pyrrolidone 872-50-4")
         text: Text to score against query
         
     Returns:
         Relevance score between 0 and 1
     """
-    try:
+    return rerank_score_bge_batch([[query, text]])[0]
+
+
+def _get_cohere_client():
+    """Create the Cohere client on first use and reuse it afterwards."""
+    global _cohere_client
+    
+    if _cohere_client is None:
         import cohere
         
         api_key = os.environ.get("COHERE_API_KEY")
         if not api_key:
             raise ValueError("COHERE_API_KEY environment variable required")
         
-        co = cohere.Client(api_key)
+        _cohere_client = cohere.Client(api_key)
+    
+    return _cohere_client
+
+
+def rerank_score_cohere_batch(query: str, texts: list[str]) -> list[float]:
+    """
+    Score many texts with a single Cohere Rerank API request.
+    
+    Args:
+        query: Search query
+        texts: Texts to score against query
+        
+    Returns:
+        Relevance scores between 0 and 1, in the same order as texts
+    """
+    if not texts:
+        return []
+    
+    try:
+        co = _get_cohere_client()
         
         response = co.rerank(
             model="rerank-v3.5",
             query=query,
-            documents=[{"text": text}],
-            top_n=1
+            documents=[{"text": text} for text in texts],
+            top_n=len(texts)
         )
         
-        if response.results:
-            return float(response.results[0].relevance_score)
-        return 0.0
+        # Results come back sorted by relevance; map them back by index
+        scores = [0.0] * len(texts)
+        for result in response.results:
+            scores[result.index] = float(result.relevance_score)
+        return scores
         
     except Exception as e:
-        print(f"Cohere scoring error: {e}")
-        return 0.0
+        logger.warning("Cohere scoring error: %s", e)
+        return [0.0] * len(texts)
 
 
-def rerank_score(query: str, text: str, method: str = "auto") -> float:
+def rerank_score_cohere(query: str, text: str) -> float:
+    """
+    Score relevance using Cohere Rerank API.
+    
+    Args:
+        query: Search query
+        text: Text to score against query
+        
+    Returns:
+        Relevance score between 0 and 1
+    """
+    return rerank_score_cohere_batch(query, [text])[0]
+
+
+async def rerank_score(query: str, text: str, method: str = "auto") -> float:
     """
     Score text relevance to query using the best available method.
     
+    Scoring runs in a worker thread so the event loop stays free.
+    
     Args:
         query: Search query
         text: Text to score
-        method: "bge", "cohere", or "auto" (tries Cohere first, falls back to BGE)
+        method: "bge", "cohere", or "auto" (Cohere when configured, BGE if it fails)
         
     Returns:
         Relevance score between 0 and 1
     """
-    if method == "bge":
-        return rerank_score_bge(query, text)
-    elif method == "cohere":
-        return rerank_score_cohere(query, text)
-    elif method == "auto":
-        # Try Cohere first (faster), fall back to BGE
-        if os.environ.get("COHERE_API_KEY"):
-            score = rerank_score_cohere(query, text)
-            if score > 0:  # If Cohere worked
-                return score
-        
-        # Fall back to local BGE
-        return rerank_score_bge(query, text)
-    else:
-        raise ValueError(f"Unknown rerank method: {method}")
+    scores = await asyncio.to_thread(batch_rerank, query, [text], method)
+    return scores[0]
+
+
+# Batches at least this large are scored locally with one BGE forward pass
+BGE_BATCH_THRESHOLD = 8
+
+
+def rerank_backends(num_texts: int) -> list[str]:
+    """
+    Backends for scoring a ranking of num_texts texts, in order of preference.
+    
+    Large batches are scored locally with one BGE forward pass; small ones
+    with Cohere when it is configured, falling back to BGE.
+    """
+    if num_texts < BGE_BATCH_THRESHOLD and os.environ.get("COHERE_API_KEY"):
+        return ["cohere", "bge"]
+    return ["bge"]
 
 
 def batch_rerank(query: str, texts: list[str], method: str = "auto") -> list[float]:
     """
     Score multiple texts against a query.
     
+    BGE scoring runs all texts through the model as a single batch, and
+    Cohere scoring sends all texts in a single request.
+    
     Args:
         query: Search query
         texts: List of texts to score
-        method: Reranking method to use
+        method: "bge", "cohere", or "auto" (local BGE for large batches, Cohere
+            for small ones with BGE rescoring the batch if Cohere fails)
         
     Returns:
         List of relevance scores
     """
-    return [rerank_score(query, text, method) for text in texts]
+    if method == "bge":
+        return rerank_score_bge_batch([[query, text] for text in texts])
+    elif method == "cohere":
+        return rerank_score_cohere_batch(query, texts)
+    elif method == "auto":
+        # Backends score on different scales, so a failure rescores the whole
+        # batch with the next backend instead of mixing scores
+        scores = [0.0] * len(texts)
+        for backend in rerank_backends(len(texts)):
+            scores = batch_rerank(query, texts, backend)
+            if all(score > 0 for score in scores):
+                break
+        return scores
+    else:
+        raise ValueError(f"Unknown rerank method: {method}")
+
+
+if __name__ == "__main__":
+    # Build the int8 ONNX model ahead of time (e.g. during the image build), so
+    # server workers only load it; fails loudly instead of falling back to torch
+    logging.basicConfig(level=logging.INFO)
+    _load_bge_onnx_int8()
+    logger.info("Int8 ONNX reranker ready in %s", BGE_ONNX_DIR)
@@ -1,19 +1,167 @@
 """Playwright-based web scraping with CAS number matching."""
+import asyncio
+import logging
+import os
 import re
-from playwright.sync_api import sync_playwright
-from urllib.parse import urlparse, urljoin
-from typing import Dict, Optional, Set, List
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import re2
+from playwright.async_api import async_playwright, Page, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from selectolax.lexbor import LexborHTMLParser
+from urllib.parse import urlparse
+from typing import AsyncIterator, Dict, Optional, Set, List, Tuple
+
+from .cache import cached_scrape
+
+logger = logging.getLogger(__name__)
+
+# Email addresses found in page text (RE2: linear time on any input)
+EMAIL_RE = re2.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+# Number of reusable pages kept open by the shared page pool
+PLAYWRIGHT_POOL_SIZE = int(os.environ.get("PLAYWRIGHT_POOL_SIZE", 5))
+
+
+# Country mentions in page text, in priority order: when several countries
+# are mentioned, the one listed first wins
+COUNTRY_PATTERNS = {
+    'United States': [r'\busa\b', r'united states', r'\bu\.s\.a\b', r'\bus\b', r'america'],
+    'United Kingdom': [r'united kingdom', r'\buk\b', r'britain', r'england', r'scotland', r'wales'],
+    'Germany': [r'germany', r'deutschland', r'german'],
+    'France': [r'france', r'french', r'français'],
+    'China': [r'china', r'chinese', r'中国', r'beijing', r'shanghai'],
+    'Japan': [r'japan', r'japanese', r'日本', r'tokyo', r'osaka'],
+    'India': [r'india', r'indian', r'mumbai', r'delhi', r'bangalore'],
+    'Canada': [r'canada', r'canadian', r'toronto', r'vancouver'],
+    'Australia': [r'australia', r'australian', r'sydney', r'melbourne'],
+    'Netherlands': [r'netherlands', r'dutch', r'amsterdam'],
+    'Switzerland': [r'switzerland', r'swiss', r'zurich'],
+    'Singapore': [r'singapore', r'singaporean'],
+    'South Korea': [r'south korea', r'korea', r'korean', r'seoul'],
+    'Italy': [r'italy', r'italian', r'milano', r'rome'],
+    'Spain': [r'spain', r'spanish', r'madrid', r'barcelona'],
+    'Belgium': [r'belgium', r'belgian', r'brussels'],
+    'Sweden': [r'sweden', r'swedish', r'stockholm'],
+    'Denmark': [r'denmark', r'danish', r'copenhagen'],
+    'Norway': [r'norway', r'norwegian', r'oslo'],
+    'Finland': [r'finland', r'finnish', r'helsinki']
+}
+
+# RE2's \b only treats ASCII letters as word characters, so "us" would match
+# inside e.g. "Usługi". Python re's Unicode-aware \b is spelled out instead.
+_WORD_START = r'(?:^|[^\pL\pN_])'
+_WORD_END = r'(?:[^\pL\pN_]|$)'
+
+
+def _re2_pattern(pattern: str) -> str:
+    """Rewrite a leading or trailing word boundary as its Unicode-aware form."""
+    if pattern.startswith(r'\b'):
+        pattern = _WORD_START + pattern[2:]
+    if pattern.endswith(r'\b'):
+        pattern = pattern[:-2] + _WORD_END
+    return pattern
+
+
+# All country patterns are compiled into one case-insensitive RE2 set, which
+# reports every matching pattern in a single linear-time pass over the text.
+# Patterns are added in priority order, so the lowest matching index is the
+# winner.
+_COUNTRY_SET_OPTIONS = re2.Options()
+_COUNTRY_SET_OPTIONS.case_sensitive = False
+_COUNTRY_SET = re2.Set.SearchSet(_COUNTRY_SET_OPTIONS)
+for _country, _patterns in COUNTRY_PATTERNS.items():
+    for _pattern in _patterns:
+        _COUNTRY_SET.Add(_re2_pattern(_pattern))
+_COUNTRY_SET.Compile()
+# Set pattern index -> country name
+_COUNTRY_SET_NAMES = tuple(
+    country for country, patterns in COUNTRY_PATTERNS.items() for _ in patterns
+)
+
+
+# Public suffix (without the leading dot) to country mapping; matched against
+# the rightmost labels of a domain, longest suffix first
+TLD_TABLE = {
+    'com': 'United States',
+    'us': 'United States', 
+    'uk': 'United Kingdom',
+    'co.uk': 'United Kingdom',
+    'de': 'Germany',
+    'fr': 'France',
+    'it': 'Italy',
+    'es': 'Spain',
+    'nl': 'Netherlands',
+    'be': 'Belgium',
+    'ch': 'Switzerland',
+    'at': 'Austria',
+    'se': 'Sweden',
+    'dk': 'Denmark',
+    'no': 'Norway',
+    'fi': 'Finland',
+    'ca': 'Canada',
+    'au': 'Australia',
+    'nz': 'New Zealand',
+    'jp': 'Japan',
+    'cn': 'China',
+    'kr': 'South Korea',
+    'in': 'India',
+    'sg': 'Singapore',
+    'hk': 'Hong Kong',
+    'tw': 'Taiwan',
+    'br': 'Brazil',
+    'mx': 'Mexico',
+    'ru': 'Russia'
+}
+
+
+# Country path segments on .com sites (e.g. example.com/de/...), scanned in one
+# pass; when several appear, the country listed first wins
+URL_COUNTRY_MAP = {
+    'us': 'United States',
+    'uk': 'United Kingdom',
+    'de': 'Germany',
+    'fr': 'France',
+    'ca': 'Canada',
+    'au': 'Australia',
+    'jp': 'Japan',
+    'cn': 'China',
+    'china': 'China',
+    'in': 'India',
+    'india': 'India',
+    'sg': 'Singapore'
+}
+URL_COUNTRY_RE = re.compile(r'/(' + '|'.join(URL_COUNTRY_MAP) + r')(?=/)')
+_URL_COUNTRY_RANK = {
+    country: rank for rank, country in enumerate(dict.fromkeys(URL_COUNTRY_MAP.values()))
+}
 
 
 def _extract_emails(text: str) -> Set[str]:
     """Extract email addresses from text using regex."""
-    email_pattern = r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"
-    return set(re.findall(email_pattern, text))
+    # Most pages have no "@" at all; skip the regex scan for them
+    if '@' not in text:
+        return set()
+    return set(EMAIL_RE.findall(text))
+
+
+def _html_text(html: str) -> str:
+    """Extract the visible body text from an HTML document."""
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(["script", "style", "noscript", "template"])
+    return tree.body.text(separator=" ") if tree.body else ""
+
+
+@lru_cache(maxsize=4096)
+def _parse_domain(url: str) -> Tuple[str, str]:
+    """Extract the domain from a URL, as written and lowercased (cached per URL)."""
+    netloc = urlparse(url).netloc
+    return netloc, netloc.lower()
 
 
 def _get_domain(url: str) -> str:
     """Extract domain from URL."""
-    return urlparse(url).netloc
+    return _parse_domain(url)[0]
 
 
 def _detect_country(url: str, page_text: str) -> str:
@@ -27,202 +175,337 @@ def _detect_country(url: str, page_text: str) -> str:
     Returns:
         Country name or "Unknown"
     """
-    # TLD to country mapping
-    tld_map = {
-        '.com': 'United States',
-        '.us': 'United States', 
-        '.uk': 'United Kingdom',
-        '.co.uk': 'United Kingdom',
-        '.de': 'Germany',
-        '.fr': 'France',
-        '.it': 'Italy',
-        '.es': 'Spain',
-        '.nl': 'Netherlands',
-        '.be': 'Belgium',
-        '.ch': 'Switzerland',
-        '.at': 'Austria',
-        '.se': 'Sweden',
-        '.dk': 'Denmark',
-        '.no': 'Norway',
-        '.fi': 'Finland',
-        '.ca': 'Canada',
-        '.au': 'Australia',
-        '.nz': 'New Zealand',
-        '.jp': 'Japan',
-        '.cn': 'China',
-        '.kr': 'South Korea',
-        '.in': 'India',
-        '.sg': 'Singapore',
-        '.hk': 'Hong Kong',
-        '.tw': 'Taiwan',
-        '.br': 'Brazil',
-        '.mx': 'Mexico',
-        '.ru': 'Russia'
-    }
-    
-    # Check URL patterns first
-    domain = _get_domain(url).lower()
-    
-    # Check for country-specific subdomains
+    # Lowercase the URL and domain once
+    url_lower = url.lower()
+    domain = _parse_domain(url)[1]
+    
+    # Check for country-specific subdomains and paths
     if '.com/' in url:
-        if '/us/' in url.lower() or 'usa.' in domain:
-            return 'United States'
-        elif '/uk/' in url.lower() or 'gb.' in domain:
-            return 'United Kingdom' 
-        elif '/de/' in url.lower():
-            return 'Germany'
-        elif '/fr/' in url.lower():
-            return 'France'
-        elif '/ca/' in url.lower():
-            return 'Canada'
-        elif '/au/' in url.lower():
-            return 'Australia'
-        elif '/jp/' in url.lower():
-            return 'Japan'
-        elif '/cn/' in url.lower() or '/china/' in url.lower():
-            return 'China'
-        elif '/in/' in url.lower() or '/india/' in url.lower():
-            return 'India'
-        elif '/sg/' in url.lower():
-            return 'Singapore'
-    
-    # Check TLD
-    for tld, country in tld_map.items():
-        if domain.endswith(tld):
+        countries = [URL_COUNTRY_MAP[token] for token in URL_COUNTRY_RE.findall(url_lower)]
+        if 'usa.' in domain:
+            countries.append('United States')
+        if 'gb.' in domain:
+            countries.append('United Kingdom')
+        if countries:
+            return min(countries, key=_URL_COUNTRY_RANK.__getitem__)
+    
+    # Check TLD: up to 3 rightmost labels, longest suffix first
+    labels = domain.split('.')
+    for n in range(min(3, len(labels) - 1), 0, -1):
+        country = TLD_TABLE.get('.'.join(labels[-n:]))
+        if country:
             return country
     
-    # Text-based detection (look for country mentions in addresses)
-    text_lower = page_text.lower()
-    
-    # Country patterns in text
-    country_patterns = {
-        'United States': [r'\busa\b', r'united states', r'\bu\.s\.a\b', r'\bus\b', r'america'],
-        'United Kingdom': [r'united kingdom', r'\buk\b', r'britain', r'england', r'scotland', r'wales'],
-        'Germany': [r'germany', r'deutschland', r'german'],
-        'France': [r'france', r'french', r'français'],
-        'China': [r'china', r'chinese', r'中国', r'beijing', r'shanghai'],
-        'Japan': [r'japan', r'japanese', r'日本', r'tokyo', r'osaka'],
-        'India': [r'india', r'indian', r'mumbai', r'delhi', r'bangalore'],
-        'Canada': [r'canada', r'canadian', r'toronto', r'vancouver'],
-        'Australia': [r'australia', r'australian', r'sydney', r'melbourne'],
-        'Netherlands': [r'netherlands', r'dutch', r'amsterdam'],
-        'Switzerland': [r'switzerland', r'swiss', r'zurich'],
-        'Singapore': [r'singapore', r'singaporean'],
-        'South Korea': [r'south korea', r'korea', r'korean', r'seoul'],
-        'Italy': [r'italy', r'italian', r'milano', r'rome'],
-        'Spain': [r'spain', r'spanish', r'madrid', r'barcelona'],
-        'Belgium': [r'belgium', r'belgian', r'brussels'],
-        'Sweden': [r'sweden', r'swedish', r'stockholm'],
-        'Denmark': [r'denmark', r'danish', r'copenhagen'],
-        'Norway': [r'norway', r'norwegian', r'oslo'],
-        'Finland': [r'finland', r'finnish', r'helsinki']
-    }
-    
-    # Look for country mentions in contact/about sections
-    for country, patterns in country_patterns.items():
-        for pattern in patterns:
-            if re.search(pattern, text_lower):
-                return country
+    # Text-based detection (look for country mentions in addresses). The set
+    # matches case-insensitively, so the page text is scanned without copying.
+    # Highest-priority country among all matching patterns wins.
+    matches = _COUNTRY_SET.Match(page_text)
+    if matches:
+        return _COUNTRY_SET_NAMES[min(matches)]
     
     return 'Unknown'
 
 
-# Keywords that indicate evidence pages (SDS, catalogs, etc.)
-KEY_LINK_HINTS = ("sds", "tds", "safety data", "product", "catalog", "datasheet")
+# Longest we wait for the network to go quiet after DOMContentLoaded (ms)
+NETWORK_IDLE_TIMEOUT = 1500
+
+
+async def _wait_for_page(page: Page):
+    """Wait for the DOM, then briefly for late (JS-rendered) content."""
+    await page.wait_for_load_state("domcontentloaded")
+    try:
+        await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT)
+    except PlaywrightTimeoutError:
+        pass
+
+
+# Checks for the CAS number in the rendered page text without transferring it
+CAS_IN_PAGE_JS = "(cas) => !!document.body && document.body.innerText.includes(cas)"
+
+
+# Collects web link targets in one call, already resolved to absolute URLs by
+# the browser (mailto:, tel:, javascript: etc. are dropped); the limit avoids
+# excessive crawling
+PAGE_LINKS_JS = "els => els.map(e => e.href).filter(h => /^https?:/i.test(h)).slice(0, 150)"
+
+
+# Keywords that indicate evidence pages (SDS, catalogs, etc.), as one alternation
+KEY_LINK_RE = re.compile(r"sds|tds|safety[\s_-]?data|product|catalog|datasheet", re.I)
+
+
+# Resource types that never contribute to page text
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+# Analytics, ad and tracking hosts
+TRACKER_HOST_RE = re.compile(
+    r"google-analytics\.com|googletagmanager\.com|googlesyndication\.com|"
+    r"doubleclick\.net|facebook\.net|hotjar\.com|clarity\.ms|hs-analytics\.net|"
+    r"linkedin\.com/(?:px|li)/|bat\.bing\.com"
+)
+
+# Default timeout for navigation and waits in pooled pages (ms); pages are
+# only read for text, so slow sites aren't worth waiting on
+PAGE_TIMEOUT = 15000
+
+
+async def _block_heavy_resources(route: Route):
+    """Abort requests for resources that aren't needed to read page text."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or TRACKER_HOST_RE.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Longest a scrape waits for a free pooled page (seconds)
+PAGE_ACQUIRE_TIMEOUT = 60
+
+
+class PagePool:
+    """
+    A persistent headless Chromium browser with a fixed set of reusable pages.
+    
+    Each page lives in its own browser context and is handed out by acquire(),
+    so browser startup is paid once rather than per scrape. Images, media,
+    fonts, stylesheets and trackers are blocked in every context. Crashed or
+    closed pages are replaced, and the browser is relaunched if it disconnects.
+    """
+    
+    def __init__(self):
+        self._playwright = None
+        self._browser = None
+        self._contexts = []
+        self._pages: Optional[asyncio.Queue] = None
+        self._crashed: Set[Page] = set()
+        self._size = 0
+        self._relaunch_lock: Optional[asyncio.Lock] = None
+    
+    @property
+    def started(self) -> bool:
+        """Whether the browser has been launched."""
+        return self._browser is not None
+    
+    async def start(self, size: int = PLAYWRIGHT_POOL_SIZE):
+        """Launch the browser and pre-create one page per context."""
+        if self.started:
+            return
+        
+        self._size = size
+        self._pages = asyncio.Queue()
+        self._relaunch_lock = asyncio.Lock()
+        try:
+            self._playwright = await async_playwright().start()
+            await self._launch()
+        except Exception:
+            # Don't leave the Playwright driver (or a half-built browser) running
+            await self.close()
+            raise
+    
+    async def _launch(self):
+        """Launch a browser and fill the queue with fresh pages, one per context."""
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        self._contexts = []
+        self._crashed = set()
+        
+        # Drop pages from a previous browser; waiters keep waiting on the same queue
+        while not self._pages.empty():
+            self._pages.get_nowait()
+        
+        for _ in range(self._size):
+            context = await self._browser.new_context()
+            context.set_default_timeout(PAGE_TIMEOUT)
+            await context.route("**/*", _block_heavy_resources)
+            self._contexts.append(context)
+            self._pages.put_nowait(await self._new_page(context))
+    
+    async def _new_page(self, context) -> Page:
+        """Open a page in a pooled context and watch it for renderer crashes."""
+        page = await context.new_page()
+        page.on("crash", self._crashed.add)
+        return page
+    
+    async def _relaunch(self):
+        """Relaunch the browser after it disconnected (e.g. was OOM-killed)."""
+        async with self._relaunch_lock:
+            if self._browser.is_connected():
+                return  # Another caller already relaunched it
+            
+            logger.warning("Browser disconnected; relaunching page pool")
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            await self._launch()
+    
+    async def close(self):
+        """Close all contexts and the browser."""
+        if self._playwright is None:
+            return
+        
+        try:
+            if self._browser is not None:
+                for context in self._contexts:
+                    await context.close()
+                await self._browser.close()
+        except Exception as e:
+            logger.debug("Error closing browser: %s", e)
+        finally:
+            await self._playwright.stop()
+            self._playwright = None
+            self._browser = None
+            self._contexts = []
+            self._pages = None
+            self._crashed = set()
+    
+    async def _release(self, page: Page):
+        """Return a borrowed page to the pool, replacing it if it is unusable."""
+        if not self._browser.is_connected():
+            try:
+                await self._relaunch()
+            except Exception as e:
+                logger.warning("Could not relaunch browser: %s", e)
+            return
+        if page.context not in self._contexts:
+            return  # Belongs to a browser that has since been relaunched
+        
+        if page.is_closed() or page in self._crashed:
+            self._crashed.discard(page)
+            context = page.context
+            try:
+                await page.close()
+            except Exception:
+                pass
+            try:
+                page = await self._new_page(context)
+            except Exception as e:
+                logger.warning("Could not replace unusable page: %s", e)
+                return
+        
+        self._pages.put_nowait(page)
+    
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Page]:
+        """
+        Borrow a page from the pool, waiting if all pages are in use.
+        
+        Raises:
+            TimeoutError: If no page frees up within PAGE_ACQUIRE_TIMEOUT seconds
+        """
+        if not self._browser.is_connected():
+            await self._relaunch()
+        
+        try:
+            page = await asyncio.wait_for(self._pages.get(), PAGE_ACQUIRE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise TimeoutError("No browser page became available") from None
+        
+        try:
+            yield page
+        finally:
+            await self._release(page)
+
+
+# Shared pool, started by the API server on startup
+page_pool = PagePool()
 
 
-def scrape_and_extract(url: str, cas: str) -> Optional[Dict]:
+@asynccontextmanager
+async def open_page_pool(size: int) -> AsyncIterator[PagePool]:
+    """
+    Yield the shared page pool if it is running, otherwise a temporary one.
+    
+    A temporary pool (e.g. for CLI runs) is closed on exit.
+    """
+    if page_pool.started:
+        yield page_pool
+        return
+    
+    pool = PagePool()
+    try:
+        await pool.start(size)
+        yield pool
+    finally:
+        await pool.close()
+
+
+@cached_scrape
+async def scrape_and_extract(page: Page, url: str, cas: str) -> Optional[Dict]:
     """
     Scrape a webpage and extract supplier information with CAS evidence.
     
     Args:
+        page: Playwright page to load the URL in (owned by the caller)
         url: URL to scrape
         cas: CAS number to look for as evidence
         
     Returns:
         Dict with supplier info and evidence URL, or None if no evidence found
     """
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    try:
+        # Load page (pool contexts set the timeout)
+        await page.goto(url)
+        await _wait_for_page(page)
         
-        try:
-            # Set timeout and load page
-            page.goto(url, timeout=30000)
-            page.wait_for_load_state("domcontentloaded")
-            
-            # Extract page content
-            html = page.content()
-            text = page.inner_text("body")
+        # Look for CAS number on current page first. The check runs inside the
+        # browser so the page text is only transferred when it's needed.
+        evidence_url = None
+        text = ""
+        emails = set()
+        if await page.evaluate(CAS_IN_PAGE_JS, cas):
+            evidence_url = url
+            text = await page.inner_text("body")
             emails = _extract_emails(text)
+        else:
+            # Follow one hop to find evidence pages (SDS, catalogs, etc.)
+            links = await page.eval_on_selector_all("a[href]", PAGE_LINKS_JS)
             
-            # Look for CAS number on current page first
-            evidence_url = None
-            if cas in text:
-                evidence_url = url
-            else:
-                # Follow one hop to find evidence pages (SDS, catalogs, etc.)
-                links = [a.get_attribute("href") for a in page.locator("a").all()]
-                links = links[:150]  # Limit to avoid excessive crawling
-                
-                # Convert relative URLs to absolute
-                absolute_links = []
-                for link in links:
-                    if link and not link.startswith("mailto:"):
-                        try:
-                            absolute_links.append(urljoin(url, link))
-                        except Exception:
-                            continue
-                
-                # Check promising links for CAS evidence
-                for link in absolute_links:
-                    if any(hint in link.lower() for hint in KEY_LINK_HINTS):
-                        try:
-                            page.goto(link, timeout=20000)
-                            page.wait_for_load_state("domcontentloaded")
-                            linked_text = page.inner_text("body")
-                            
-                            if cas in linked_text:
-                                evidence_url = link
-                                # Also collect emails from evidence page
-                                emails.update(_extract_emails(linked_text))
-                                break
-                        except Exception:
-                            continue
-            
-            # Extract supplier name from page title or domain
-            try:
-                supplier_name = page.title().split("|")[0].strip()[:120]
-                if not supplier_name:
-                    supplier_name = _get_domain(url)
-            except Exception:
+            # Check promising links for CAS evidence
+            for link in links:
+                if KEY_LINK_RE.search(link):
+                    try:
+                        await page.goto(link)
+                        await _wait_for_page(page)
+                        linked_text = _html_text(await page.content())
+                        
+                        if cas in linked_text:
+                            evidence_url = link
+                            text = linked_text
+                            # Collect emails from evidence page
+                            emails.update(_extract_emails(linked_text))
+                            break
+                    except Exception:
+                        continue
+        
+        # Extract supplier name from page title or domain
+        try:
+            supplier_name = (await page.title()).split("|")[0].strip()[:120]
+            if not supplier_name:
                 supplier_name = _get_domain(url)
+        except Exception:
+            supplier_name = _get_domain(url)
+        
+        # Only return results if we found CAS evidence
+        if evidence_url:
+            # Detect country from URL and evidence page content
+            country = _detect_country(url, text)
             
-            browser.close()
-            
-            # Only return results if we found CAS evidence
-            if evidence_url:
-                # Detect country from URL and page content
-                country = _detect_country(url, text)
-                
-                return {
-                    "supplier_name": supplier_name,
-                    "website": f"https://{_get_domain(url)}",
-                    "evidence_url": evidence_url,
-                    "emails": list(emails),
-                    "country": country
-                }
-            
-        except Exception as e:
-            print(f"Scraping error for {url}: {e}")
-            browser.close()
+            return {
+                "supplier_name": supplier_name,
+                "website": f"https://{_get_domain(url)}",
+                "evidence_url": evidence_url,
+                "emails": list(emails),
+                "country": country
+            }
+        
+    except Exception as e:
+        logger.debug("Scraping error for %s: %s", url, e)
     
     return None
 
 
-def batch_scrape(urls: List[str], cas: str, max_workers: int = 5) -> List[Dict]:
+async def batch_scrape(urls: List[str], cas: str, max_workers: int = 5) -> List[Dict]:
     """
-    Scrape multiple URLs in parallel.
+    Scrape multiple URLs concurrently using pooled browser pages.
     
     Args:
         urls: List of URLs to scrape
@@ -232,23 +515,27 @@ def batch_scrape(urls: List[str], cas: str, max_workers: int = 5) -> List[Dict]:
     Returns:
         List of extracted supplier data (only those with evidence)
     """
-    import concurrent.futures
-    
-    results = []
+    if not urls:
+        return []
     
-    def scrape_single(url):
-        return scrape_and_extract(url, cas)
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(scrape_single, url): url for url in urls}
+    # A temporary pool never needs more pages than there are URLs
+    async with open_page_pool(min(max_workers, len(urls))) as pool:
+        sem = asyncio.Semaphore(max_workers)
         
-        for future in concurrent.futures.as_completed(futures):
-            try:
-                result = future.result()
-                if result:
-                    results.append(result)
-            except Exception as e:
-                url = futures[future]
-                print(f"Error processing {url}: {e}")
+        async def scrape_single(url):
+            async with sem, pool.acquire() as page:
+                return await scrape_and_extract(page, url, cas)
+        
+        scraped = await asyncio.gather(
+            *(scrape_single(url) for url in urls),
+            return_exceptions=True
+        )
+    
+    results = []
+    for url, result in zip(urls, scraped):
+        if isinstance(result, Exception):
+            logger.warning("Error processing %s: %s", url, result)
+        elif result:
+            results.append(result)
     
     return results
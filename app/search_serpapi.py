@@ -1,12 +1,22 @@
 """SerpAPI-based search functionality for chemical suppliers."""
+import asyncio
+import logging
 import os
 from typing import List, Dict
 
-try:
-    from serpapi.google_search import GoogleSearch
-except ImportError:
-    # Alternative import approach
-    from serpapi import GoogleSearch
+import httpx
+
+logger = logging.getLogger(__name__)
+
+SERPAPI_URL = "https://serpapi.com/search.json"
+
+# Most SerpAPI requests in flight at once per search
+SERPAPI_CONCURRENCY = 8
+
+# Shared HTTP client, so TCP/TLS connections to SerpAPI are reused across
+# searches. Clients are bound to the event loop they were created on.
+_client = None
+_client_loop = None
 
 # Target high-signal supplier directories and marketplaces
 DEFAULT_QUERIES = [
@@ -21,10 +31,92 @@ DEFAULT_QUERIES = [
 ]
 
 
-def search_candidates(name: str, cas: str, num_pages: int = 2) -> List[Dict[str, str]]:
+def _get_client() -> httpx.AsyncClient:
+    """Return the SerpAPI HTTP client for the running event loop."""
+    global _client, _client_loop
+    
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+        _client_loop = loop
+    
+    return _client
+
+
+async def close_client():
+    """Close the SerpAPI HTTP client, if one was created; call before its event loop ends."""
+    global _client, _client_loop
+    
+    if _client is not None:
+        client, _client, _client_loop = _client, None, None
+        await client.aclose()
+
+
+async def _fetch_page(
+    client: httpx.AsyncClient,
+    params: Dict,
+    semaphore: asyncio.Semaphore
+) -> Dict:
+    """Fetch one page of search results, or an empty dict on error."""
+    async with semaphore:
+        try:
+            response = await client.get(SERPAPI_URL, params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            # Never log the exception itself: its message includes the request
+            # URL, and with it the API key
+            logger.warning(
+                "Search error for query '%s': HTTP %d", params["q"], e.response.status_code
+            )
+        except Exception as e:
+            logger.warning("Search error for query '%s': %s", params["q"], type(e).__name__)
+        return {}
+
+
+async def _search_query(
+    client: httpx.AsyncClient,
+    query: str,
+    api_key: str,
+    num_pages: int,
+    semaphore: asyncio.Semaphore
+) -> List[Dict]:
+    """
+    Fetch organic results for one query, page by page.
+    
+    Stops early once a page comes back short or SerpAPI reports no more
+    results, so niche queries don't pay for empty pages.
+    """
+    items = []
+    for start in range(0, num_pages * 10, 10):
+        params = {
+            "engine": "google",
+            "q": query,
+            "num": 10,
+            "start": start,
+            "api_key": api_key
+        }
+        data = await _fetch_page(client, params, semaphore)
+        page_items = data.get("organic_results", [])
+        items.extend(page_items)
+        
+        total_results = data.get("search_information", {}).get("total_results")
+        if len(page_items) < 10 or (total_results is not None and total_results <= start + 10):
+            break
+    
+    return items
+
+
+async def search_candidates(name: str, cas: str, num_pages: int = 2) -> List[Dict[str, str]]:
     """
     Search for chemical suppliers using multiple query patterns.
     
+    Queries run concurrently; each query's pages are fetched in order so
+    paging can stop as soon as the results run out.
+    
     Args:
         name: Chemical name (e.g., "N-Methyl-2-pyrrolidone")
         cas: CAS number (e.g., "872-50-4")
@@ -38,40 +130,24 @@ def search_candidates(name: str, cas: str, num_pages: int = 2) -> List[Dict[str,
         raise ValueError("SERPAPI_KEY environment variable is required")
         
     queries = [q.format(name=name, cas=cas) for q in DEFAULT_QUERIES]
-    results = []
     
-    for query in queries:
-        for start in range(0, num_pages * 10, 10):
-            params = {
-                "engine": "google",
-                "q": query,
-                "num": 10,
-                "start": start,
-                "api_key": api_key
-            }
-            
-            try:
-                search = GoogleSearch(params)
-                data = search.get_dict()
-                
-                for item in data.get("organic_results", []):
-                    results.append({
-                        "title": item.get("title", ""),
-                        "link": item.get("link", ""),
-                        "snippet": item.get("snippet", ""),
-                        "query": query
-                    })
-            except Exception as e:
-                print(f"Search error for query '{query}': {e}")
-                continue
+    client = _get_client()
+    semaphore = asyncio.Semaphore(SERPAPI_CONCURRENCY)
+    query_results = await asyncio.gather(
+        *(_search_query(client, query, api_key, num_pages, semaphore) for query in queries)
+    )
     
-    # Deduplicate by URL while preserving order
-    seen = set()
-    unique_results = []
-    for result in results:
-        url = result["link"]
-        if url and url not in seen:
-            seen.add(url)
-            unique_results.append(result)
+    # Deduplicate by URL in query order (dicts preserve insertion order)
+    unique_results = {}
+    for query, items in zip(queries, query_results):
+        for item in items:
+            link = item.get("link", "")
+            if link and link not in unique_results:
+                unique_results[link] = {
+                    "title": item.get("title", ""),
+                    "link": link,
+                    "snippet": item.get("snippet", ""),
+                    "query": query
+                }
     
-    return unique_results
+    return list(unique_results.values())
@@ -0,0 +1,48 @@
+"""Celery task queue for long-running supplier searches."""
+import asyncio
+import os
+from typing import List, Optional
+from dotenv import load_dotenv
+from celery import Celery
+
+from .agent import run_agent
+from .cache import close_client as close_cache_client
+from .search_serpapi import close_client as close_search_client
+
+# Load environment variables (workers are started independently of the API)
+load_dotenv()
+
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+
+celery_app = Celery("chemagent", broker=REDIS_URL, backend=REDIS_URL)
+celery_app.conf.update(
+    task_track_started=True,
+    result_expires=24 * 60 * 60,
+)
+
+
+@celery_app.task
+def run_agent_task(
+    chemical_name: str,
+    cas: str,
+    limit: int = 10,
+    excluded_countries: Optional[List[str]] = None,
+    allowed_countries: Optional[List[str]] = None
+) -> dict:
+    """Run a supplier search in a worker and return the AgentResult as JSON-safe data."""
+    async def run():
+        # Each task gets a fresh event loop, so release its clients with it
+        try:
+            return await run_agent(
+                chemical_name=chemical_name,
+                cas=cas,
+                limit=limit,
+                excluded_countries=set(excluded_countries or []),
+                allowed_countries=set(allowed_countries or [])
+            )
+        finally:
+            await close_search_client()
+            await close_cache_client()
+    
+    result = asyncio.run(run())
+    return result.model_dump(mode="json")
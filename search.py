@@ -15,6 +15,8 @@ Examples:
 
 import sys
 import argparse
+import asyncio
+import logging
 from dotenv import load_dotenv
 from app.agent import run_agent
 
@@ -84,6 +86,9 @@ Examples:
     
     args = parser.parse_args()
     
+    # Show agent progress messages
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     chemical_name = args.chemical_name
     cas = args.cas
     
@@ -130,7 +135,7 @@ Examples:
     print()
     
     try:
-        result = run_agent(chemical_name, cas, limit=10, excluded_countries=excluded_countries, allowed_countries=allowed_countries)
+        result = asyncio.run(run_agent(chemical_name, cas, limit=10, excluded_countries=excluded_countries, allowed_countries=allowed_countries))
         
         # Print summary
         print(f"Found {len(result.suppliers)} suppliers")